@@ -15,12 +15,25 @@ Environment variables:
 """
 
 import argparse
+import asyncio
+import collections
+import contextlib
+import errno
+import functools
+import gc
+import itertools
+import json
 import os
+import queue
+import shutil
 import socket
+import subprocess
+import sys
+import threading
 import time
-import statistics
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Tuple, Protocol
+from typing import (
+    Any, Callable, Deque, Dict, Generic, Iterator, List, Optional, Sequence, Set, Tuple, Protocol, TypeVar, Union,
+)
 
 # Optional MySQL connector
 try:
@@ -29,53 +42,593 @@ try:
 except ImportError:
     HAS_MYSQL = False
 
+# Optional io_uring bindings (Linux only) for the uring driver
+try:
+    import liburing
+    HAS_LIBURING = True
+except ImportError:
+    HAS_LIBURING = False
+
+
+T = TypeVar('T')
+# Query type accepted by a client: a command string for MygramDB, a
+# (sql, params) pair for MySQL
+Q = TypeVar('Q')
+Q_contra = TypeVar('Q_contra', contravariant=True)
+
+DEFAULT_PERCENTILES = [50.0, 95.0, 99.0]
+
+# Initial size of each worker thread's MygramDB receive buffer; it doubles
+# (and stays doubled) if a response outgrows it
+RECV_BUFFER_BYTES = 1 << 16
+
+# StreamReader line limit for the async driver; large enough for any SEARCH reply
+MAX_RESPONSE_BYTES = 1 << 24
+
+# Compiled MygramDB driver (driver-rs/), found in its cargo build directory or on PATH
+RUST_DRIVER = 'mygram-bench'
+RUST_DRIVER_BUILD = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'driver-rs', 'target', 'release', RUST_DRIVER
+)
+
+# Size of each provided receive buffer of the io_uring driver
+URING_BUFFER_BYTES = 1 << 14
+
+# GIL switch interval (seconds) during the timed window. The interpreter
+# default of 5 ms lets a worker hold the GIL while another's reply waits.
+SWITCH_INTERVAL = 5e-5
+
+
+# (success, elapsed_ns, raw response); callers decode the response only
+# when they need it, e.g. to report an error. MygramDB clients keep the
+# response of failed queries only and return b"" for successes.
+QueryResult = Tuple[bool, int, bytes]
+
+# (sql, params) for a server-side prepared statement
+MySQLQuery = Tuple[str, Tuple[Union[str, int], ...]]
+
+# Extra (level, option, value) settings applied to each MygramDB socket
+SocketOptions = Sequence[Tuple[int, int, int]]
+
+# Linux SO_BUSY_POLL; the socket module doesn't export it
+SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46)
 
-class BenchmarkClient(Protocol):
+
+class BenchmarkClient(Protocol[Q_contra]):
     """Protocol for benchmark clients"""
-    def query(self, cmd: str, timeout: float = 60.0) -> Tuple[bool, float, str]: ...
+    def query(self, cmd: Q_contra, timeout: float = 60.0) -> QueryResult: ...
+
+    def close(self) -> None: ...
+
+
+def tune_socket(sock: Any, options: SocketOptions = ()) -> None:
+    """Set the options shared by all MygramDB connections, then the extra options"""
+    # Requests are tiny; don't let Nagle hold them back waiting for an ACK
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for level, option, value in options:
+        sock.setsockopt(level, option, value)
+
+
+@functools.lru_cache(maxsize=None)
+def encode_command(cmd: str) -> bytes:
+    """Encode a MygramDB command as a wire frame
+
+    The benchmark replays a handful of commands, so each one is encoded once
+    instead of on every call.
+    """
+    return (cmd + "\r\n").encode('utf-8')
+
+
+SUCCESS_PREFIXES = (b"OK ", b"(integer)")
+
+
+def is_success(data: Union[bytes, bytearray], start: int = 0, end: Optional[int] = None) -> bool:
+    """Classify the MygramDB response in data[start:end] by its first bytes"""
+    return data.startswith(SUCCESS_PREFIXES, start, len(data) if end is None else end)
+
+
+def decode_response(response: bytes) -> str:
+    """Decode a raw response for reporting"""
+    return response.decode('utf-8', errors='ignore')
+
+
+class LatencyHistogram:
+    """Constant-memory latency histogram in integer nanoseconds
+
+    Uses the HdrHistogram bucket layout: every power-of-two range is split
+    into 1024 linear sub-buckets, so percentiles keep 3 significant digits
+    (within 0.1%) while memory depends only on the value range, not on the
+    number of samples. Count, sum, min and max are tracked exactly.
+    """
+
+    SIGNIFICANT_BITS = 11
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """Record one latency sample"""
+        self.count += 1
+        self.total += value
+        if self.count == 1 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        shift = value.bit_length() - self.SIGNIFICANT_BITS
+        if shift > 0:
+            # Lowest value of the sub-bucket that holds value
+            value = value >> shift << shift
+        self.counts[value] = self.counts.get(value, 0) + 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add all samples recorded in other"""
+        if not other.count:
+            return
+        if not self.count or other.min < self.min:
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+
+    def percentile(self, p: float) -> int:
+        """Return the highest value equivalent to the p-th percentile sample"""
+        rank = min(self.count, int(self.count * p / 100) + 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                shift = max(0, bucket.bit_length() - self.SIGNIFICANT_BITS)
+                return min(bucket + (1 << shift) - 1, self.max)
+        return self.max
+
+
+class ConnectionPool(Generic[T]):
+    """Thread-safe pool of reusable connections
+
+    Connections are opened lazily on first use and kept for the lifetime of
+    the pool, so the benchmark measures query cost rather than TCP setup.
+
+    Idle connections live in `size` stripes (deques, whose append/pop are
+    atomic) instead of behind one shared lock. Each thread gets its own home
+    stripe and probes the ring starting there, so a worker normally takes
+    back the connection it just returned and threads do not all contend on
+    the same slot.
+
+    If reset is given, it is applied to every reused connection and returns
+    the connection to hand out. Time spent opening and resetting connections
+    is recorded separately from query time.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], T],
+        disconnect: Callable[[T], None],
+        size: int,
+        reset: Optional[Callable[[T], T]] = None,
+    ):
+        self._connect = connect
+        self._disconnect = disconnect
+        self._reset = reset
+        self._stripes: List[Deque[T]] = [collections.deque() for _ in range(max(1, size))]
+        self._local = threading.local()
+        self._next_home = itertools.count()
+        self._stats_lock = threading.Lock()
+        self.connect_times = LatencyHistogram()
+        self.reset_times = LatencyHistogram()
+
+    def _home(self) -> int:
+        home = getattr(self._local, 'home', None)
+        if home is None:
+            home = self._local.home = next(self._next_home) % len(self._stripes)
+        return home
+
+    def _take_idle(self) -> Optional[T]:
+        stripes = self._stripes
+        home = self._home()
+        for i in range(len(stripes)):
+            try:
+                return stripes[(home + i) % len(stripes)].pop()
+            except IndexError:
+                continue
+        return None
+
+    def acquire(self) -> T:
+        """Take an idle connection, opening a new one if none is available"""
+        conn = self._take_idle()
+        if conn is None:
+            start = time.perf_counter_ns()
+            conn = self._connect()
+            self._record(self.connect_times, start)
+            return conn
+
+        if self._reset is None:
+            return conn
+        start = time.perf_counter_ns()
+        try:
+            conn = self._reset(conn)
+        except Exception:
+            self.discard(conn)
+            raise
+        self._record(self.reset_times, start)
+        return conn
+
+    def _record(self, hist: LatencyHistogram, start_ns: int) -> None:
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        with self._stats_lock:
+            hist.record(elapsed_ns)
+
+    def session_stats(self) -> dict:
+        """Summarize connection setup and reset cost, keyed 'connect'/'reset'"""
+        stats = {}
+        for name, hist in (('connect', self.connect_times), ('reset', self.reset_times)):
+            if hist.count:
+                stats[name] = {
+                    'count': hist.count,
+                    'avg_ms': hist.total / hist.count / 1e6,
+                    'max_ms': hist.max / 1e6,
+                }
+        return stats
+
+    def release(self, conn: T) -> None:
+        """Return a healthy connection to the calling thread's home stripe"""
+        self._stripes[self._home()].append(conn)
+
+    def discard(self, conn: T) -> None:
+        """Close a connection that must not be reused (e.g. after an I/O error)"""
+        try:
+            self._disconnect(conn)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Close all idle connections"""
+        while True:
+            conn = self._take_idle()
+            if conn is None:
+                break
+            self.discard(conn)
 
 
 class MygramDBClient:
-    """MygramDB TCP client"""
+    """MygramDB TCP client backed by a pool of persistent connections
+
+    Responses are read with recv_into() into a receive buffer owned by the
+    calling thread and reused across queries, so the hot path allocates no
+    per-chunk bytes objects.
+    """
+
+    def __init__(self, host: str, port: int, pool_size: int = 1, sockopts: SocketOptions = ()):
+        self.host = host
+        self.port = port
+        self.sockopts = sockopts
+        self.pool: ConnectionPool[socket.socket] = ConnectionPool(self._connect, socket.socket.close, pool_size)
+        self._local = threading.local()
 
-    def __init__(self, host: str, port: int):
+    def _buffer(self) -> bytearray:
+        buf = getattr(self._local, 'buf', None)
+        if buf is None:
+            buf = self._local.buf = bytearray(RECV_BUFFER_BYTES)
+        return buf
+
+    def _connect(self) -> socket.socket:
+        sock = socket.create_connection((self.host, self.port))
+        tune_socket(sock, self.sockopts)
+        return sock
+
+    def query(self, cmd: str, timeout: float = 60.0) -> QueryResult:
+        """Execute query and return (success, elapsed_ns, response)"""
+        return self.query_many([cmd], timeout)[0]
+
+    def query_many(self, cmds: List[str], timeout: float = 60.0) -> List[QueryResult]:
+        """Pipeline cmds on one connection and return a result per command
+
+        All requests go out in a single write; each latency runs from that
+        write to the arrival of the matching response.
+        """
+        try:
+            sock = self.pool.acquire()
+        except Exception as e:
+            return [(False, 0, str(e).encode())] * len(cmds)
+
+        # (end offset, elapsed_ns) of each complete response in data
+        ends: List[Tuple[int, int]] = []
+        data = self._buffer()
+        try:
+            # settimeout() toggles O_NONBLOCK with a syscall; skip it when the
+            # pooled socket already has the right timeout
+            if sock.gettimeout() != timeout:
+                sock.settimeout(timeout)
+
+            frame = b"".join(map(encode_command, cmds))
+            recv_into = sock.recv_into
+            filled = 0
+            scan = 0
+
+            start_ns = time.perf_counter_ns()
+            sock.sendall(frame)
+
+            while len(ends) < len(cmds):
+                if filled == len(data):
+                    # The view below is a temporary, so no buffer export
+                    # blocks the resize
+                    data += bytes(len(data))
+                received = recv_into(memoryview(data)[filled:])
+                if not received:
+                    raise ConnectionError("connection closed by server")
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                filled += received
+                # Each response ends with \r\n (possibly split across reads)
+                while len(ends) < len(cmds):
+                    pos = data.find(b"\r\n", scan, filled)
+                    if pos < 0:
+                        scan = max(scan, filled - 1)
+                        break
+                    scan = pos + 2
+                    ends.append((scan, elapsed_ns))
+        except Exception as e:
+            self.pool.discard(sock)
+            error = str(e).encode()
+        else:
+            self.pool.release(sock)
+            error = b""
+
+        results: List[QueryResult] = []
+        offset = 0
+        for end, elapsed_ns in ends:
+            if is_success(data, offset, end):
+                results.append((True, elapsed_ns, b""))
+            else:
+                results.append((False, elapsed_ns, bytes(memoryview(data)[offset:end])))
+            offset = end
+        results.extend([(False, 0, error)] * (len(cmds) - len(ends)))
+        return results
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class AsyncMygramDBClient:
+    """MygramDB asyncio client; each worker coroutine owns one connection"""
+
+    def __init__(self, host: str, port: int, sockopts: SocketOptions = ()):
         self.host = host
         self.port = port
+        self.sockopts = sockopts
+
+    async def connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit=MAX_RESPONSE_BYTES)
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            tune_socket(sock, self.sockopts)
+        return reader, writer
+
+    async def query_many(
+        self,
+        conn: Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        cmds: List[str],
+        timeout: float = 60.0,
+    ) -> List[QueryResult]:
+        """Pipeline cmds on conn and return a result per command
+
+        On an I/O error, responses that already arrived are kept, the rest
+        fail with the error and conn is closed; the caller checks
+        writer.is_closing() to reconnect.
+        """
+        reader, writer = conn
+        results: List[QueryResult] = []
 
-    def query(self, cmd: str, timeout: float = 60.0) -> Tuple[bool, float, str]:
-        """Execute query and return (success, elapsed_ms, response)"""
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            sock.connect((self.host, self.port))
+            start_ns = time.perf_counter_ns()
+            writer.write(b"".join(map(encode_command, cmds)))
+            await writer.drain()
+            for _ in cmds:
+                data = await asyncio.wait_for(reader.readuntil(b"\r\n"), timeout)
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                success = is_success(data)
+                results.append((success, elapsed_ns, b"" if success else data))
+        except Exception as e:
+            writer.close()
+            if isinstance(e, asyncio.IncompleteReadError):
+                error = b"connection closed by server"
+            elif isinstance(e, asyncio.TimeoutError):
+                error = f"timed out after {timeout:g}s".encode()
+            else:
+                error = (str(e) or type(e).__name__).encode()
+            results.extend([(False, 0, error)] * (len(cmds) - len(results)))
+        return results
 
-            start = time.perf_counter()
-            sock.sendall((cmd + "\r\n").encode('utf-8'))
 
-            data = b""
-            while True:
-                chunk = sock.recv(65536)
-                if not chunk:
-                    break
-                data += chunk
-                # Response ends with \r\n
-                if data.endswith(b"\r\n"):
-                    break
-
-            elapsed = (time.perf_counter() - start) * 1000
+class MygramDBIoUringClient:
+    """MygramDB client driving one connection per slot from a single io_uring
+
+    Connections are registered (fixed) files, each with one multishot recv
+    armed for as long as it is open. Receives take buffers from a shared
+    group of provided buffers that is refilled as each completion is
+    consumed, so a batch costs a single send SQE and each io_uring_enter()
+    submits and reaps the I/O of every connection at once.
+    """
+
+    # Operation tag kept in the low bits of user_data; the slot is in the rest
+    OP_SEND = 0
+    OP_RECV = 1
+    OP_CANCEL = 2
+    OP_PROVIDE = 3
+
+    # Group id of the provided receive buffers
+    BUFFER_GROUP = 0
+
+    def __init__(self, host: str, port: int, connections: int, sockopts: SocketOptions = ()):
+        self.host = host
+        self.port = port
+        self.sockopts = sockopts
+        self.ring = liburing.Ring()
+        # Buffer ids are 16-bit
+        self.buffers = [bytearray(URING_BUFFER_BYTES) for _ in range(min(max(2 * connections, 64), 1 << 15))]
+        # A connection has at most a send, a recv (re-)arm and a cancel queued,
+        # plus one provide per buffer; _sqe() flushes the queue if it fills up
+        entries = min(3 * connections + len(self.buffers), 4096)
+        try:
+            liburing.io_uring_queue_init(
+                entries, self.ring, liburing.IORING_SETUP_SINGLE_ISSUER | liburing.IORING_SETUP_DEFER_TASKRUN
+            )
+        except OSError:
+            # DEFER_TASKRUN needs Linux 6.1
+            liburing.io_uring_queue_init(entries, self.ring)
+        # -1 marks an empty slot in the registered file table
+        liburing.io_uring_register_files(self.ring, liburing.FileIndex([-1] * connections))
+        self.socks: List[Optional[socket.socket]] = [None] * connections
+        # Whether the slot's multishot recv is still armed
+        self.receiving = [False] * connections
+        # The kernel reads a frame after submission, so keep it alive until its send completes
+        self._frames: List[bytes] = [b""] * connections
+        self._cqe = liburing.Cqe()
+        for bid in range(len(self.buffers)):
+            self._provide(bid)
+
+    def connect(self, slot: int) -> None:
+        sock = socket.create_connection((self.host, self.port))
+        tune_socket(sock, self.sockopts)
+        liburing.io_uring_register_files_update(self.ring, liburing.FileIndex([sock.fileno()]), slot)
+        self.socks[slot] = sock
+        self.recv(slot)
+
+    def disconnect(self, slot: int) -> None:
+        """Close the slot's connection; its recv must no longer be armed"""
+        sock = self.socks[slot]
+        if sock is not None:
+            liburing.io_uring_register_files_update(self.ring, liburing.FileIndex([-1]), slot)
             sock.close()
+            self.socks[slot] = None
 
-            response = data.decode('utf-8', errors='ignore')
-            success = response.startswith("OK ") or response.startswith("(integer)")
-            return success, elapsed, response
-        except Exception as e:
-            return False, 0.0, str(e)
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _timespec(seconds: float) -> Any:
+        return liburing.timespec(seconds)
+
+    def _queue(self, slot: int, op: int, flags: int, prep: Callable[..., None], *args: Any) -> None:
+        sqe = liburing.io_uring_get_sqe(self.ring)
+        if sqe is None:
+            liburing.io_uring_submit(self.ring)
+            sqe = liburing.io_uring_get_sqe(self.ring)
+        # prep clears the flags, so they are set afterwards
+        prep(sqe, *args)
+        sqe.flags = flags
+        sqe.user_data = (slot << 2) | op
+
+    def _prep_recv(self, sqe: Any, slot: int) -> None:
+        liburing.io_uring_prep_recv_multishot(sqe, slot, None, 0)
+        liburing.io_uring_sqe_set_buf_group(sqe, self.BUFFER_GROUP)
+
+    def _provide(self, bid: int) -> None:
+        # Only a failure posts a completion
+        self._queue(
+            bid, self.OP_PROVIDE, liburing.IOSQE_CQE_SKIP_SUCCESS,
+            liburing.io_uring_prep_provide_buffers, self.buffers[bid], 1, self.BUFFER_GROUP, bid,
+        )
+
+    def send(self, slot: int, cmds: List[str]) -> None:
+        """Queue the pipelined cmds on slot; replies arrive on its multishot recv"""
+        frame = self._frames[slot] = b"".join(map(encode_command, cmds))
+        # MSG_WAITALL makes a short send an error rather than a partial success
+        self._queue(
+            slot, self.OP_SEND, liburing.IOSQE_FIXED_FILE, liburing.io_uring_prep_send, slot, frame, socket.MSG_WAITALL
+        )
+
+    def recv(self, slot: int) -> None:
+        """Arm a multishot recv on slot that selects buffers from the provided group"""
+        self._queue(
+            slot, self.OP_RECV, liburing.IOSQE_FIXED_FILE | liburing.IOSQE_BUFFER_SELECT,
+            self._prep_recv, slot,
+        )
+        self.receiving[slot] = True
+
+    def cancel_recv(self, slot: int) -> None:
+        """Cancel the slot's multishot recv; its final completion reports ECANCELED"""
+        self._queue(
+            slot, self.OP_CANCEL, liburing.IOSQE_CQE_SKIP_SUCCESS,
+            liburing.io_uring_prep_cancel64, (slot << 2) | self.OP_RECV, 0,
+        )
+
+    def consume(self, bid: int, size: int, into: Optional[bytearray]) -> None:
+        """Append the data a recv completion placed in buffer bid to into, then hand the buffer back
+
+        With into None the data is dropped. The copy has to come first: queueing
+        the provide may flush the SQ, after which the kernel can refill the buffer.
+        """
+        if into is not None:
+            into += memoryview(self.buffers[bid])[:size]
+        self._provide(bid)
+
+    def reap(self, wait: float) -> List[Tuple[int, int, Union[int, OSError], int]]:
+        """Submit queued operations and return (slot, op, result, cqe flags) per completion
+
+        Waits up to `wait` seconds for the first completion. A failed
+        operation's result is the OSError for its errno.
+        """
+        ring = self.ring
+        cqe = self._cqe
+        completions: List[Tuple[int, int, Union[int, OSError], int]] = []
+        try:
+            liburing.io_uring_submit_and_wait_timeout(ring, cqe, 1, self._timespec(wait))
+        except OSError as e:
+            if e.errno not in (errno.ETIME, errno.EINTR):
+                raise
+        while True:
+            try:
+                liburing.io_uring_peek_cqe(ring, cqe)
+            except BlockingIOError:
+                return completions
+            entry = cqe[0]
+            user_data = entry.user_data
+            flags = entry.flags
+            res: Union[int, OSError]
+            try:
+                res = entry.res
+            except OSError as e:
+                res = e
+            liburing.io_uring_cqe_seen(ring, entry)
+            completions.append((user_data >> 2, user_data & 3, res, flags))
+
+    def close(self) -> None:
+        # Tearing down the ring cancels the armed recvs before the sockets close
+        liburing.io_uring_queue_exit(self.ring)
+        for sock in self.socks:
+            if sock is not None:
+                sock.close()
+        self.socks = [None] * len(self.socks)
 
 
 class MySQLClient:
-    """MySQL client using mysql-connector-python"""
+    """MySQL client using mysql-connector-python
+
+    Connections are pooled with ConnectionPool rather than
+    mysql.connector.pooling, which caps pools at 32 connections and raises
+    instead of blocking when exhausted. Each pooled connection carries its
+    own prepared-statement cursor, so a statement is prepared once per
+    connection and then only executed.
+
+    Pooled sessions are not reset between queries unless reset_session is
+    set, in which case every reuse pays a COM_RESET_CONNECTION round trip
+    (recorded separately from query time), like a pool with reset-on-return.
+    """
 
-    def __init__(self, host: str, port: int, user: str, password: str, database: str):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        pool_size: int = 1,
+        reset_session: bool = False,
+    ):
         self.config = {
             'host': host,
             'port': port,
@@ -84,114 +637,733 @@ class MySQLClient:
             'database': database,
             'charset': 'utf8mb4',
             'use_unicode': True,
+            # Pooled connections must not hold a transaction (and its read
+            # snapshot) open across queries
+            'autocommit': True,
         }
+        self.pool: ConnectionPool = ConnectionPool(
+            self._connect, self._disconnect, pool_size, self._reset if reset_session else None
+        )
 
-    def query(self, sql: str, timeout: float = 60.0) -> Tuple[bool, float, str]:
-        """Execute query and return (success, elapsed_ms, response)"""
-        if not HAS_MYSQL:
-            return False, 0.0, "mysql-connector-python not installed"
+    def _connect(self) -> Tuple[Any, Any]:
+        conn = mysql.connector.connect(**self.config)
+        # The C extension (libmysqlclient) already sets TCP_NODELAY, but the
+        # pure Python protocol leaves Nagle enabled on its socket
+        sock = getattr(getattr(conn, '_socket', None), 'sock', None)
+        if isinstance(sock, socket.socket) and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn, MySQLClient._cursor(conn)
 
-        try:
-            conn = mysql.connector.connect(**self.config)
-            cursor = conn.cursor()
+    @staticmethod
+    def _cursor(conn: Any) -> Any:
+        return conn.cursor(prepared=True)
 
-            start = time.perf_counter()
-            cursor.execute(sql)
-            results = cursor.fetchall()
-            elapsed = (time.perf_counter() - start) * 1000
+    @staticmethod
+    def _reset(session: Tuple[Any, Any]) -> Tuple[Any, Any]:
+        conn, cursor = session
+        # The reset deallocates the session's prepared statements, so the
+        # cached cursor's statement handle would be gone anyway; close it
+        # first and start a fresh cursor
+        cursor.close()
+        # Returns False instead of raising if the server can't reset the
+        # session; the pool then discards the connection
+        if conn.cmd_reset_connection() is False:
+            raise ConnectionError("COM_RESET_CONNECTION failed")
+        return conn, MySQLClient._cursor(conn)
 
+    @staticmethod
+    def _disconnect(session: Tuple[Any, Any]) -> None:
+        conn, cursor = session
+        try:
             cursor.close()
+        finally:
             conn.close()
 
-            return True, elapsed, f"{len(results)} rows"
+    def query(self, cmd: MySQLQuery, timeout: float = 60.0) -> QueryResult:
+        """Execute (sql, params) as a prepared statement and return (success, elapsed_ns, response)"""
+        if not HAS_MYSQL:
+            return False, 0, b"mysql-connector-python not installed"
+
+        try:
+            session = self.pool.acquire()
         except Exception as e:
-            return False, 0.0, str(e)
+            return False, 0, str(e).encode()
+
+        try:
+            sql, params = cmd
+            cursor = session[1]
+
+            start_ns = time.perf_counter_ns()
+            cursor.execute(sql, params)
+            # The result set must be drained before the next execute. fetchall()
+            # reads it in one batch; iterating the cursor would fetch row by row.
+            rows = len(cursor.fetchall())
+            elapsed_ns = time.perf_counter_ns() - start_ns
+        except Exception as e:
+            self.pool.discard(session)
+            return False, 0, str(e).encode()
+
+        self.pool.release(session)
+        return True, elapsed_ns, b"%d rows" % rows
+
+    def close(self) -> None:
+        self.pool.close()
 
 
 def run_benchmark(
-    client: BenchmarkClient,
+    client: BenchmarkClient[Q],
+    queries: List[Q],
+    concurrency: int,
+    iterations: int,
+    pipeline: int = 1,
+    percentiles: List[float] = DEFAULT_PERCENTILES,
+    raw: bool = False,
+    warmup: int = 0,
+    switch_interval: float = SWITCH_INTERVAL,
+) -> dict:
+    """Run benchmark with given queries and concurrency
+
+    Runs `concurrency` worker threads fed lazily through a bounded queue, so
+    harness memory stays O(concurrency) regardless of iterations. With
+    pipeline > 1 (MygramDB only), each worker sends batches of up to
+    `pipeline` commands per round trip. `warmup` untimed queries run on the
+    same workers and connections before the timer starts. Per-query
+    latencies are only kept when raw is set.
+    """
+
+    total_queries = len(queries) * iterations
+
+    def execute_one(batch: List[Q]) -> List[QueryResult]:
+        return [client.query(batch[0])]
+
+    execute: Callable[[List[Any]], List[QueryResult]] = execute_one
+    if pipeline > 1:
+        if not isinstance(client, MygramDBClient):
+            raise ValueError("pipelining is only supported by MygramDBClient")
+        execute = client.query_many
+
+    # Bounded hand-off queue: the feeder blocks once every worker has a
+    # couple of batches waiting, which is the back-pressure on submission
+    work: "queue.Queue[Optional[List[Q]]]" = queue.Queue(maxsize=2 * concurrency)
+    # Per-worker (histogram, raw times, errors), merged after join. Replaced
+    # wholesale once the warmup phase has drained.
+    stats: List[Tuple[LatencyHistogram, Optional[List[int]], List[str]]] = [
+        (LatencyHistogram(), None, []) for _ in range(concurrency)
+    ]
+
+    # Holds each worker with its first warmup batch until all have one, so
+    # they run it at the same time and the pool has to open every connection
+    warming = threading.Barrier(concurrency) if warmup else None
+
+    def worker(slot: int) -> None:
+        barrier = warming
+        while True:
+            batch = work.get()
+            if batch is None:
+                break
+            hist, times, errors = stats[slot]
+            if barrier is not None:
+                barrier.wait()
+                barrier = None
+            try:
+                batch_results = execute(batch)
+            except Exception as e:
+                errors.extend([str(e)] * len(batch))
+                continue
+            finally:
+                work.task_done()
+            for success, elapsed_ns, response in batch_results:
+                if success:
+                    hist.record(elapsed_ns)
+                    if times is not None:
+                        times.append(elapsed_ns)
+                else:
+                    errors.append(decode_response(response))
+
+    threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    if warmup:
+        for batch in batched(warmup_queries(queries, warmup, concurrency, pipeline), pipeline):
+            work.put(batch)
+        work.join()
+    stats[:] = [(LatencyHistogram(), [] if raw else None, []) for _ in range(concurrency)]
+
+    with tuned_interpreter(switch_interval):
+        start_ns = time.perf_counter_ns()
+
+        for batch in batched(workload(queries, iterations), pipeline):
+            work.put(batch)
+        for _ in threads:
+            work.put(None)
+        for thread in threads:
+            thread.join()
+
+        total_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
+
+    hist = LatencyHistogram()
+    times: Optional[List[int]] = [] if raw else None
+    errors: List[str] = []
+    for worker_hist, worker_times, worker_errors in stats:
+        hist.merge(worker_hist)
+        if times is not None and worker_times is not None:
+            times.extend(worker_times)
+        errors.extend(worker_errors)
+
+    return summarize(total_queries, total_time_ms, hist, errors, percentiles, times)
+
+
+def run_benchmark_async(
+    client: AsyncMygramDBClient,
     queries: List[str],
     concurrency: int,
     iterations: int,
+    pipeline: int = 1,
+    percentiles: List[float] = DEFAULT_PERCENTILES,
+    raw: bool = False,
+    warmup: int = 0,
+    switch_interval: float = SWITCH_INTERVAL,
 ) -> dict:
-    """Run benchmark with given queries and concurrency"""
+    """Run benchmark on a single event loop with one connection per worker
+
+    Runs `warmup` untimed queries on the same connections first.
+    """
 
-    times: List[float] = []
+    hist = LatencyHistogram()
+    times: Optional[List[int]] = [] if raw else None
     errors: List[str] = []
-    successful = 0
-    failed = 0
+    total_queries = len(queries) * iterations
+    # One connection slot per worker, kept across the warmup and timed phases
+    conns: List[Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = [None] * concurrency
 
-    def execute_query(query: str) -> Tuple[bool, float, str]:
-        return client.query(query)
+    async def worker(
+        slot: int,
+        pending: Iterator[str],
+        hist: LatencyHistogram,
+        times: Optional[List[int]],
+        errors: List[str],
+    ) -> None:
+        while True:
+            batch = list(itertools.islice(pending, pipeline))
+            if not batch:
+                break
+            conn = conns[slot]
+            if conn is None:
+                try:
+                    conn = conns[slot] = await client.connect()
+                except Exception as e:
+                    errors.extend([str(e) or type(e).__name__] * len(batch))
+                    continue
+            batch_results = await client.query_many(conn, batch)
+            if conn[1].is_closing():
+                conns[slot] = None
 
-    all_queries = queries * iterations
+            for success, elapsed_ns, response in batch_results:
+                if success:
+                    hist.record(elapsed_ns)
+                    if times is not None:
+                        times.append(elapsed_ns)
+                else:
+                    errors.append(decode_response(response))
 
-    start_total = time.perf_counter()
+    async def run_phase(pending: Iterator[str], hist: LatencyHistogram, times: Optional[List[int]],
+                        errors: List[str]) -> None:
+        # Workers share one lazy iterator, so at most `concurrency` batches are in flight
+        await asyncio.gather(*(worker(slot, pending, hist, times, errors) for slot in range(concurrency)))
 
-    with ThreadPoolExecutor(max_workers=concurrency) as executor:
-        futures = [executor.submit(execute_query, q) for q in all_queries]
+    async def run_all() -> float:
+        if warmup:
+            await run_phase(warmup_queries(queries, warmup, concurrency, pipeline), LatencyHistogram(), None, [])
 
-        for future in as_completed(futures):
-            success, elapsed, response = future.result()
+        with tuned_interpreter(switch_interval):
+            start_ns = time.perf_counter_ns()
+            await run_phase(workload(queries, iterations), hist, times, errors)
+            total_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
-            if success:
-                successful += 1
-                times.append(elapsed)
-            else:
-                failed += 1
-                errors.append(response)
+        for conn in conns:
+            if conn is not None:
+                conn[1].close()
+                await conn[1].wait_closed()
+        return total_time_ms
+
+    total_time_ms = asyncio.run(run_all())
+
+    return summarize(total_queries, total_time_ms, hist, errors, percentiles, times)
 
-    total_time_ms = (time.perf_counter() - start_total) * 1000
+
+class _UringBatch:
+    """Pipelined commands in flight on one io_uring connection"""
+
+    __slots__ = ('cmds', 'start_ns', 'deadline_ns', 'data', 'scan', 'ends', 'sending', 'error', 'cancelled')
+
+    def __init__(self, cmds: List[str], start_ns: int, timeout_ns: int):
+        self.cmds = cmds
+        self.start_ns = start_ns
+        self.deadline_ns = start_ns + timeout_ns
+        self.data = bytearray()
+        self.scan = 0
+        # (end offset, elapsed_ns) of each complete response in data
+        self.ends: List[Tuple[int, int]] = []
+        # Whether the send completion is still outstanding
+        self.sending = True
+        self.error = ""
+        self.cancelled = False
+
+
+def run_benchmark_uring(
+    client: MygramDBIoUringClient,
+    queries: List[str],
+    concurrency: int,
+    iterations: int,
+    pipeline: int = 1,
+    percentiles: List[float] = DEFAULT_PERCENTILES,
+    raw: bool = False,
+    warmup: int = 0,
+    switch_interval: float = SWITCH_INTERVAL,
+    timeout: float = 60.0,
+) -> dict:
+    """Run benchmark from one thread with every connection on the client's io_uring
+
+    Each of the `concurrency` connections keeps one batch of `pipeline`
+    commands in flight; a connection sends its next batch as soon as the
+    last reply of the previous one is reaped. Runs `warmup` untimed queries
+    on the same connections first.
+    """
+
+    hist = LatencyHistogram()
+    times: Optional[List[int]] = [] if raw else None
+    errors: List[str] = []
+    total_queries = len(queries) * iterations
+    timeout_ns = int(timeout * 1e9)
+    # A multishot recv can't carry a link timeout, so deadlines are checked
+    # between waits at this interval
+    check_interval = min(timeout, 0.1)
+
+    def run_phase(pending: Iterator[str], hist: LatencyHistogram, times: Optional[List[int]],
+                  errors: List[str]) -> None:
+        batches: List[Optional[_UringBatch]] = [None] * concurrency
+
+        def start(slot: int) -> bool:
+            while True:
+                cmds = list(itertools.islice(pending, pipeline))
+                if not cmds:
+                    batches[slot] = None
+                    return False
+                try:
+                    if client.socks[slot] is not None and not client.receiving[slot]:
+                        # The server went away while the connection was idle
+                        client.disconnect(slot)
+                    if client.socks[slot] is None:
+                        client.connect(slot)
+                except Exception as e:
+                    errors.extend([str(e) or type(e).__name__] * len(cmds))
+                    continue
+                batches[slot] = _UringBatch(cmds, time.perf_counter_ns(), timeout_ns)
+                client.send(slot, cmds)
+                return True
+
+        def fail(slot: int, batch: _UringBatch, error: str) -> None:
+            batch.error = batch.error or error
+            if client.receiving[slot] and not batch.cancelled:
+                batch.cancelled = True
+                client.cancel_recv(slot)
+
+        def settle(slot: int, batch: _UringBatch) -> bool:
+            """Record a batch once nothing is in flight for it and start the next; False if the slot is done"""
+            if batch.sending:
+                return True
+            if batch.error:
+                # Close only once the recv has stopped using the connection
+                if client.receiving[slot]:
+                    return True
+            elif len(batch.ends) < len(batch.cmds):
+                return True
+
+            data = batch.data
+            offset = 0
+            for end, elapsed_ns in batch.ends:
+                if is_success(data, offset, end):
+                    hist.record(elapsed_ns)
+                    if times is not None:
+                        times.append(elapsed_ns)
+                else:
+                    errors.append(decode_response(bytes(memoryview(data)[offset:end])))
+                offset = end
+            missing = len(batch.cmds) - len(batch.ends)
+            if missing:
+                client.disconnect(slot)
+                errors.extend([batch.error] * missing)
+            return start(slot)
+
+        active = sum(start(slot) for slot in range(concurrency))
+        next_check_ns = time.perf_counter_ns() + int(check_interval * 1e9)
+        while active:
+            for slot, op, res, flags in client.reap(check_interval):
+                if op == client.OP_PROVIDE or op == client.OP_CANCEL:
+                    # A cancel can race the recv ending on its own; a failed
+                    # provide just leaves one buffer fewer
+                    continue
+                batch = batches[slot]
+                if op == client.OP_SEND:
+                    assert batch is not None
+                    batch.sending = False
+                    if isinstance(res, OSError):
+                        fail(slot, batch, str(res))
+                else:
+                    if flags & liburing.IORING_CQE_F_BUFFER:
+                        assert isinstance(res, int)
+                        bid = flags >> liburing.IORING_CQE_BUFFER_SHIFT
+                        if batch is None or batch.error:
+                            client.consume(bid, res, None)
+                        else:
+                            elapsed_ns = time.perf_counter_ns() - batch.start_ns
+                            data = batch.data
+                            client.consume(bid, res, data)
+                            filled = len(data)
+                            # Each response ends with \r\n (possibly split across reads)
+                            while len(batch.ends) < len(batch.cmds):
+                                pos = data.find(b"\r\n", batch.scan, filled)
+                                if pos < 0:
+                                    batch.scan = max(batch.scan, filled - 1)
+                                    break
+                                batch.scan = pos + 2
+                                batch.ends.append((batch.scan, elapsed_ns))
+                    if not flags & liburing.IORING_CQE_F_MORE:
+                        client.receiving[slot] = False
+                        if isinstance(res, OSError) and res.errno == errno.ENOBUFS and not (batch and batch.error):
+                            # Every provided buffer was in use; they are back now
+                            client.recv(slot)
+                        elif batch is not None:
+                            fail(slot, batch, "connection closed by server" if res == 0 else str(res))
+                if batch is not None and not settle(slot, batch):
+                    active -= 1
+
+            now_ns = time.perf_counter_ns()
+            if now_ns >= next_check_ns:
+                next_check_ns = now_ns + int(check_interval * 1e9)
+                for slot, batch in enumerate(batches):
+                    if batch is not None and not batch.error and now_ns >= batch.deadline_ns:
+                        fail(slot, batch, f"timed out after {timeout:g}s")
+                        if not settle(slot, batch):
+                            active -= 1
+
+    if warmup:
+        run_phase(warmup_queries(queries, warmup, concurrency, pipeline), LatencyHistogram(), None, [])
+
+    with tuned_interpreter(switch_interval):
+        start_ns = time.perf_counter_ns()
+        run_phase(workload(queries, iterations), hist, times, errors)
+        total_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
+
+    return summarize(total_queries, total_time_ms, hist, errors, percentiles, times)
+
+
+def find_rust_driver() -> Optional[str]:
+    """Locate the compiled driver: the local cargo build first, then PATH"""
+    if os.access(RUST_DRIVER_BUILD, os.X_OK):
+        return RUST_DRIVER_BUILD
+    return shutil.which(RUST_DRIVER)
+
+
+def run_benchmark_rust(
+    driver: str,
+    host: str,
+    port: int,
+    table: str,
+    words: List[str],
+    query_type: str,
+    limit: int,
+    concurrency: int,
+    iterations: int,
+    offset: int = 0,
+    pipeline: int = 1,
+    percentiles: List[float] = DEFAULT_PERCENTILES,
+    warmup: int = 0,
+    rcvbuf: int = 0,
+    sndbuf: int = 0,
+) -> dict:
+    """Run the MygramDB benchmark in the compiled Rust driver
+
+    The driver builds the same queries and workload and prints the dict
+    summarize() returns as JSON; at most 100 error messages are kept, the
+    failure count is exact.
+    """
+    cmd = [
+        driver,
+        '--host', host,
+        '--port', str(port),
+        '--table', table,
+        '--words', ','.join(words),
+        '--query-type', query_type,
+        '--limit', str(limit),
+        '--offset', str(offset),
+        '--concurrency', str(concurrency),
+        '--iterations', str(iterations),
+        '--pipeline', str(pipeline),
+        '--warmup', str(warmup),
+        '--percentiles', ','.join(map(repr, percentiles)),
+        '--rcvbuf', str(rcvbuf),
+        '--sndbuf', str(sndbuf),
+    ]
+    # The driver's diagnostics go straight to our stderr
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, check=True)
+    results: dict = json.loads(proc.stdout)
+    # JSON object keys are strings (and come back in string order)
+    if 'percentiles_ms' in results:
+        results['percentiles_ms'] = {
+            p: value for p, value in sorted((float(p), value) for p, value in results['percentiles_ms'].items())
+        }
+    return results
+
+
+@contextlib.contextmanager
+def tuned_interpreter(switch_interval: float = SWITCH_INTERVAL) -> Iterator[None]:
+    """Shorten the GIL switch interval and pause the cyclic GC for the duration
+
+    A switch_interval of 0 keeps the current interval. Both settings are
+    restored on exit.
+    """
+    old_interval = sys.getswitchinterval()
+    gc_was_enabled = gc.isenabled()
+    if switch_interval:
+        sys.setswitchinterval(switch_interval)
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        sys.setswitchinterval(old_interval)
+
+
+def workload(queries: List[Q], iterations: int) -> Iterator[Q]:
+    """Yield queries `iterations` times over without materializing the list"""
+    return itertools.chain.from_iterable(itertools.repeat(queries, iterations))
+
+
+def warmup_queries(queries: List[Q], warmup: int, concurrency: int, pipeline: int = 1) -> Iterator[Q]:
+    """Cycle queries for the untimed warmup phase
+
+    Runs at least one full batch per worker, so every connection can be
+    opened before timing starts.
+    """
+    return itertools.islice(itertools.cycle(queries), max(warmup, concurrency * pipeline))
+
+
+def batched(items: Iterator[Q], size: int) -> Iterator[List[Q]]:
+    """Group items into lists of up to size"""
+    while True:
+        batch = list(itertools.islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def has_enough_samples(p: float, n: int) -> bool:
+    """Whether n samples are enough for percentile p to differ from the maximum
+
+    Tail percentiles need at least 100 / (100 - p) samples (20 for P95, 1000
+    for P99.9). The comparison allows for 100 - p not being exact in binary.
+
+    >>> has_enough_samples(99.9, 1000), has_enough_samples(99.9, 999)
+    (True, False)
+    >>> has_enough_samples(95, 20), has_enough_samples(95, 19)
+    (True, False)
+    >>> has_enough_samples(50, 1)
+    True
+    """
+    return p <= 50 or n * (100 - p) >= 100 - 1e-9
+
+
+def summarize(
+    total_queries: int,
+    total_time_ms: float,
+    hist: LatencyHistogram,
+    errors: List[str],
+    percentiles: List[float] = DEFAULT_PERCENTILES,
+    times: Optional[List[int]] = None,
+) -> dict:
+    """Build the results dict from the latency histogram and errors
+
+    Latencies stay integer nanoseconds until converted to milliseconds
+    here. Raw per-query latencies (ns) are included under 'times_ns' only
+    when given.
+    """
 
     results: dict = {
-        'total_queries': len(all_queries),
-        'successful': successful,
-        'failed': failed,
+        'total_queries': total_queries,
+        'successful': hist.count,
+        'failed': len(errors),
         'total_time_ms': total_time_ms,
-        'times': times,
         'errors': errors,
     }
+    if times is not None:
+        results['times_ns'] = times
 
-    if times:
-        results['avg_ms'] = statistics.mean(times)
-        results['min_ms'] = min(times)
-        results['max_ms'] = max(times)
-        results['p50_ms'] = statistics.median(times)
-        if len(times) >= 20:
-            sorted_times = sorted(times)
-            p95_idx = int(len(sorted_times) * 0.95)
-            p99_idx = int(len(sorted_times) * 0.99)
-            results['p95_ms'] = sorted_times[p95_idx]
-            results['p99_ms'] = sorted_times[p99_idx]
+    if hist.count:
+        n = hist.count
+        results['avg_ms'] = hist.total / n / 1e6
+        results['min_ms'] = hist.min / 1e6
+        results['max_ms'] = hist.max / 1e6
+        results['percentiles_ms'] = {
+            p: hist.percentile(p) / 1e6
+            for p in percentiles
+            if has_enough_samples(p, n)
+        }
 
     return results
 
 
+def non_negative_int(value: str) -> int:
+    """Parse an integer option that must be at least 0"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value!r}")
+    return number
+
+
+def non_negative_float(value: str) -> float:
+    """Parse a float option that must be at least 0"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {value!r}")
+    # Written so that NaN fails too
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"must be a number >= 0: {value!r}")
+    return number
+
+
+def positive_int(value: str) -> int:
+    """Parse an integer option that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value!r}")
+    return number
+
+
+def parse_percentiles(value: str) -> List[float]:
+    """Parse a comma-separated percentile list such as 50,95,99,99.9"""
+    try:
+        percentiles = [float(p) for p in value.split(',') if p.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid percentile list: {value!r}")
+    if not percentiles or not all(0 < p < 100 for p in percentiles):
+        raise argparse.ArgumentTypeError("percentiles must be between 0 and 100 (exclusive)")
+    return sorted(set(percentiles))
+
+
+def parse_cpu_list(value: str) -> List[int]:
+    """Parse a CPU list in taskset syntax such as 0,2,4-7"""
+    cpus: Set[int] = set()
+    try:
+        for part in value.split(','):
+            first, _, last = part.strip().partition('-')
+            cpus.update(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid CPU list: {value!r}")
+    if not cpus or min(cpus) < 0:
+        raise argparse.ArgumentTypeError(f"invalid CPU list: {value!r}")
+    return sorted(cpus)
+
+
+def write_raw_times(path: str, target: str, both: bool, times: List[int]) -> str:
+    """Write per-query latencies (ns) one per line and return the file written
+
+    With both targets benchmarked, the target name goes before the extension
+    of path so the runs do not overwrite each other.
+    """
+    if both:
+        root, ext = os.path.splitext(path)
+        path = f"{root}.{target}{ext}"
+    with open(path, 'w') as f:
+        f.writelines(f"{ns}\n" for ns in times)
+    return path
+
+
+def print_results(results: dict) -> None:
+    """Print a benchmark results dict"""
+    print(f"Total queries: {results['total_queries']}")
+    print(f"Successful: {results['successful']}")
+    print(f"Failed: {results['failed']}")
+    print(f"Total time: {results['total_time_ms']:.1f}ms")
+    if results['successful']:
+        print(f"Avg: {results['avg_ms']:.2f}ms")
+        print(f"Min: {results['min_ms']:.2f}ms")
+        print(f"Max: {results['max_ms']:.2f}ms")
+        for p, value in results['percentiles_ms'].items():
+            print(f"P{p:g}: {value:.2f}ms")
+        print(f"QPS: {results['successful'] / (results['total_time_ms'] / 1000):.1f}")
+    # Session setup happens outside the per-query timings (including warmup)
+    if 'connect' in results:
+        stats = results['connect']
+        print(f"Connections opened: {stats['count']} (avg {stats['avg_ms']:.2f}ms, max {stats['max_ms']:.2f}ms)")
+    if 'reset' in results:
+        stats = results['reset']
+        print(f"Session resets: {stats['count']} (avg {stats['avg_ms']:.2f}ms, max {stats['max_ms']:.2f}ms)")
+    if results['errors']:
+        print(f"Errors: {results['errors'][:3]}")
+    print()
+
+
+def build_socket_options(rcvbuf: int = 0, sndbuf: int = 0, busy_poll_us: int = 0) -> List[Tuple[int, int, int]]:
+    """Build the extra MygramDB socket options; 0 keeps the kernel default
+
+    An explicit SO_RCVBUF/SO_SNDBUF turns off the kernel's buffer autotuning
+    for that socket and is capped by net.core.rmem_max/wmem_max.
+    """
+    options = []
+    if rcvbuf:
+        options.append((socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf))
+    if sndbuf:
+        options.append((socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf))
+    if busy_poll_us:
+        options.append((socket.SOL_SOCKET, SO_BUSY_POLL, busy_poll_us))
+    return options
+
+
 def build_mygramdb_queries(table: str, words: List[str], query_type: str, limit: int, offset: int = 0) -> List[str]:
-    """Build MygramDB queries"""
-    queries = []
-    for word in words:
-        if query_type == 'search':
-            if offset > 0:
-                queries.append(f"SEARCH {table} {word} SORT id ASC LIMIT {offset},{limit}")
-            else:
-                queries.append(f"SEARCH {table} {word} SORT id ASC LIMIT {limit}")
-        elif query_type == 'count':
-            queries.append(f"COUNT {table} {word}")
-    return queries
+    """Build MygramDB queries
+
+    The parts of the command around the search word are formatted once; each
+    query is then a plain concatenation.
+    """
+    if query_type == 'search':
+        paging = f"{offset},{limit}" if offset > 0 else f"{limit}"
+        prefix, suffix = f"SEARCH {table} ", f" SORT id ASC LIMIT {paging}"
+    elif query_type == 'count':
+        prefix, suffix = f"COUNT {table} ", ""
+    else:
+        return []
+    return [prefix + word + suffix for word in words]
+
 
+def build_mysql_queries(
+    table: str, column: str, words: List[str], query_type: str, limit: int, offset: int = 0
+) -> List[MySQLQuery]:
+    """Build parameterized MySQL FULLTEXT queries
 
-def build_mysql_queries(table: str, column: str, words: List[str], query_type: str, limit: int, offset: int = 0):
-    """Build MySQL FULLTEXT queries"""
-    queries = []
-    for word in words:
-        match_clause = f"MATCH({column}) AGAINST('{word}' IN BOOLEAN MODE)"
-        if query_type == 'search':
-            sql = f"SELECT id FROM {table} WHERE enabled=1 AND {match_clause} ORDER BY id LIMIT {offset},{limit}"
-            queries.append(sql)
-        elif query_type == 'count':
-            queries.append(f"SELECT COUNT(*) FROM {table} WHERE enabled=1 AND {match_clause}")
-    return queries
+    Table and column are identifiers and are interpolated once; the search
+    word and paging values are bound parameters. All queries share one SQL
+    string object because mysql-connector only reuses a prepared statement
+    when the operation is the very object it executed last.
+    """
+    match_clause = f"MATCH({column}) AGAINST(%s IN BOOLEAN MODE)"
+    if query_type == 'search':
+        sql = f"SELECT id FROM {table} WHERE enabled=1 AND {match_clause} ORDER BY id LIMIT %s, %s"
+        return [(sql, (word, offset, limit)) for word in words]
+    if query_type == 'count':
+        sql = f"SELECT COUNT(*) FROM {table} WHERE enabled=1 AND {match_clause}"
+        return [(sql, (word,)) for word in words]
+    return []
 
 
 def main():
@@ -201,10 +1373,38 @@ def main():
     parser.add_argument('--column', default='name', help='FULLTEXT column (MySQL only)')
     parser.add_argument('--words', required=True, help='Comma-separated search words')
     parser.add_argument('--query-type', choices=['search', 'count'], default='search', help='Query type')
-    parser.add_argument('--limit', type=int, default=100, help='LIMIT for search queries')
-    parser.add_argument('--offset', type=int, default=0, help='OFFSET for search queries (pagination)')
-    parser.add_argument('--concurrency', type=int, default=1, help='Number of concurrent queries')
-    parser.add_argument('--iterations', type=int, default=5, help='Iterations per query')
+    parser.add_argument('--limit', type=non_negative_int, default=100, help='LIMIT for search queries')
+    parser.add_argument('--offset', type=non_negative_int, default=0, help='OFFSET for search queries (pagination)')
+    parser.add_argument('--concurrency', type=positive_int, default=1, help='Number of concurrent queries')
+    parser.add_argument('--iterations', type=positive_int, default=5, help='Iterations per query')
+    # Defaults of None are filled in after parsing, so --engine rust can tell explicit values apart
+    parser.add_argument('--driver', choices=['thread', 'async', 'uring'],
+                        help='Concurrency model: worker threads (default), a single asyncio event loop, or a '
+                             'single io_uring (Linux, needs liburing) (MygramDB only)')
+    parser.add_argument('--engine', choices=['python', 'rust'], default='python',
+                        help='MygramDB load generator: the Python drivers or the compiled driver in driver-rs/')
+    parser.add_argument('--rust-driver', help='Path to the compiled driver (default: driver-rs build, then PATH)')
+    parser.add_argument('--pipeline', type=positive_int, default=1,
+                        help='Commands sent per round trip on each connection (MygramDB only)')
+    parser.add_argument('--percentiles', type=parse_percentiles, default=DEFAULT_PERCENTILES,
+                        help='Comma-separated latency percentiles to report (e.g. 50,95,99,99.9)')
+    parser.add_argument('--raw', metavar='PATH',
+                        help='Also write every per-query latency (ns) to PATH, one per line')
+    parser.add_argument('--warmup', type=non_negative_int, default=100,
+                        help='Untimed queries run before measurement starts (0 to disable)')
+    parser.add_argument('--rcvbuf', type=non_negative_int, default=0,
+                        help='SO_RCVBUF in bytes for MygramDB sockets (0 keeps kernel autotuning)')
+    parser.add_argument('--sndbuf', type=non_negative_int, default=0,
+                        help='SO_SNDBUF in bytes for MygramDB sockets (0 keeps kernel autotuning)')
+    parser.add_argument('--busy-poll-us', type=non_negative_int, default=0,
+                        help='SO_BUSY_POLL in microseconds for MygramDB sockets (Linux, 0 to disable)')
+    parser.add_argument('--switch-interval', type=non_negative_float,
+                        help=f'GIL switch interval in seconds during the timed window (default {SWITCH_INTERVAL:g}; '
+                             '0 keeps the interpreter default)')
+    parser.add_argument('--pin-cpu', type=parse_cpu_list,
+                        help='Pin the benchmark process to these CPUs (e.g. 4-7; Linux only)')
+    parser.add_argument('--reset-session', action='store_true',
+                        help='Reset each pooled session (COM_RESET_CONNECTION) before reuse (MySQL only)')
 
     # Connection options (override env vars)
     parser.add_argument('--mysql-host', help='MySQL host')
@@ -216,6 +1416,37 @@ def main():
     parser.add_argument('--mygramdb-port', type=int, help='MygramDB port')
 
     args = parser.parse_args()
+    if args.driver == 'uring' and not HAS_LIBURING:
+        parser.error("--driver uring requires liburing (pip install liburing)")
+    if args.engine == 'rust':
+        if args.raw is not None or args.busy_poll_us:
+            parser.error("--raw and --busy-poll-us are not supported with --engine rust")
+        if args.driver is not None:
+            parser.error("--driver selects a Python driver and can't be combined with --engine rust")
+        if args.switch_interval is not None and args.target == 'mygramdb':
+            # With --target both it still applies to the MySQL run
+            parser.error("--switch-interval has no effect on the Rust driver")
+        # which() also checks that an explicit path is executable
+        args.rust_driver = shutil.which(args.rust_driver) if args.rust_driver else find_rust_driver()
+        if not args.rust_driver:
+            parser.error(
+                "--engine rust needs the compiled driver: "
+                "cargo build --release --locked --manifest-path driver-rs/Cargo.toml"
+            )
+    if args.driver is None:
+        args.driver = 'thread'
+    if args.switch_interval is None:
+        args.switch_interval = SWITCH_INTERVAL
+    if args.busy_poll_us and not sys.platform.startswith('linux'):
+        parser.error("--busy-poll-us is only supported on Linux")
+    if args.pin_cpu:
+        if not hasattr(os, 'sched_setaffinity'):
+            parser.error("--pin-cpu is not supported on this platform")
+        # Threads (and the Rust driver) started later inherit the affinity
+        try:
+            os.sched_setaffinity(0, args.pin_cpu)
+        except OSError as e:
+            parser.error(f"--pin-cpu {','.join(map(str, args.pin_cpu))}: {e.strerror}")
 
     words = [w.strip() for w in args.words.split(',')]
 
@@ -241,34 +1472,69 @@ def main():
     print(f"Limit: {args.limit}, Offset: {args.offset}")
     print(f"Concurrency: {args.concurrency}")
     print(f"Iterations: {args.iterations}")
+    print(f"Warmup: {args.warmup}")
+    print(f"Engine: {args.engine}")
+    if args.engine == 'python':
+        print(f"Driver: {args.driver}")
+    print(f"Pipeline: {args.pipeline}")
+    if args.pin_cpu:
+        print(f"CPUs: {','.join(map(str, args.pin_cpu))}")
     print()
 
+    raw = args.raw is not None
+    both = args.target == 'both'
+
     # MygramDB benchmark
     if args.target in ('mygramdb', 'both'):
         print("=== MygramDB Benchmark ===")
         print(f"Host: {mygramdb_config['host']}:{mygramdb_config['port']}")
 
-        client = MygramDBClient(mygramdb_config['host'], mygramdb_config['port'])
         queries = build_mygramdb_queries(args.table, words, args.query_type, args.limit, args.offset)
+        sockopts = build_socket_options(args.rcvbuf, args.sndbuf, args.busy_poll_us)
 
-        results = run_benchmark(client, queries, args.concurrency, args.iterations)
-
-        print(f"Total queries: {results['total_queries']}")
-        print(f"Successful: {results['successful']}")
-        print(f"Failed: {results['failed']}")
-        print(f"Total time: {results['total_time_ms']:.1f}ms")
-        if results['times']:
-            print(f"Avg: {results['avg_ms']:.2f}ms")
-            print(f"Min: {results['min_ms']:.2f}ms")
-            print(f"Max: {results['max_ms']:.2f}ms")
-            print(f"P50: {results['p50_ms']:.2f}ms")
-            if 'p95_ms' in results:
-                print(f"P95: {results['p95_ms']:.2f}ms")
-                print(f"P99: {results['p99_ms']:.2f}ms")
-            print(f"QPS: {results['successful'] / (results['total_time_ms'] / 1000):.1f}")
-        if results['errors']:
-            print(f"Errors: {results['errors'][:3]}")
-        print()
+        if args.engine == 'rust':
+            try:
+                results = run_benchmark_rust(
+                    args.rust_driver, mygramdb_config['host'], mygramdb_config['port'], args.table, words,
+                    args.query_type, args.limit, args.concurrency, args.iterations, args.offset, args.pipeline,
+                    args.percentiles, args.warmup, args.rcvbuf, args.sndbuf,
+                )
+            except subprocess.CalledProcessError as e:
+                # The driver has already printed its own diagnostics to stderr
+                sys.exit(f"error: {args.rust_driver} exited with status {e.returncode}")
+        elif args.driver == 'uring':
+            uring_client = MygramDBIoUringClient(
+                mygramdb_config['host'], mygramdb_config['port'], args.concurrency, sockopts
+            )
+            try:
+                results = run_benchmark_uring(
+                    uring_client, queries, args.concurrency, args.iterations, args.pipeline, args.percentiles,
+                    raw, args.warmup, args.switch_interval,
+                )
+            finally:
+                uring_client.close()
+        elif args.driver == 'async':
+            async_client = AsyncMygramDBClient(mygramdb_config['host'], mygramdb_config['port'], sockopts)
+            results = run_benchmark_async(
+                async_client, queries, args.concurrency, args.iterations, args.pipeline, args.percentiles, raw,
+                args.warmup, args.switch_interval,
+            )
+        else:
+            client = MygramDBClient(
+                mygramdb_config['host'], mygramdb_config['port'], pool_size=args.concurrency, sockopts=sockopts
+            )
+            try:
+                results = run_benchmark(
+                    client, queries, args.concurrency, args.iterations, args.pipeline, args.percentiles, raw,
+                    args.warmup, args.switch_interval,
+                )
+            finally:
+                client.close()
+            results.update(client.pool.session_stats())
+
+        print_results(results)
+        if args.raw is not None:
+            print(f"Raw latencies: {write_raw_times(args.raw, 'mygramdb', both, results['times_ns'])}")
 
     # MySQL benchmark
     if args.target in ('mysql', 'both'):
@@ -287,27 +1553,24 @@ def main():
                 mysql_config['user'],
                 mysql_config['password'],
                 mysql_config['database'],
+                pool_size=args.concurrency,
+                reset_session=args.reset_session,
             )
             queries = build_mysql_queries(args.table, args.column, words, args.query_type, args.limit, args.offset)
 
-            results = run_benchmark(client, queries, args.concurrency, args.iterations)
-
-            print(f"Total queries: {results['total_queries']}")
-            print(f"Successful: {results['successful']}")
-            print(f"Failed: {results['failed']}")
-            print(f"Total time: {results['total_time_ms']:.1f}ms")
-            if results['times']:
-                print(f"Avg: {results['avg_ms']:.2f}ms")
-                print(f"Min: {results['min_ms']:.2f}ms")
-                print(f"Max: {results['max_ms']:.2f}ms")
-                print(f"P50: {results['p50_ms']:.2f}ms")
-                if 'p95_ms' in results:
-                    print(f"P95: {results['p95_ms']:.2f}ms")
-                    print(f"P99: {results['p99_ms']:.2f}ms")
-                print(f"QPS: {results['successful'] / (results['total_time_ms'] / 1000):.1f}")
-            if results['errors']:
-                print(f"Errors: {results['errors'][:3]}")
-            print()
+            try:
+                results = run_benchmark(
+                    client, queries, args.concurrency, args.iterations,
+                    percentiles=args.percentiles, raw=raw, warmup=args.warmup,
+                    switch_interval=args.switch_interval,
+                )
+            finally:
+                client.close()
+            results.update(client.pool.session_stats())
+
+            print_results(results)
+            if args.raw is not None:
+                print(f"Raw latencies: {write_raw_times(args.raw, 'mysql', both, results['times_ns'])}")
 
 
 if __name__ == '__main__':
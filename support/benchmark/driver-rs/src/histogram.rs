@@ -0,0 +1,72 @@
+//! Latency histogram with the same bucket layout as benchmark.py's
+//! `LatencyHistogram`, so both engines report identical percentiles for
+//! identical samples.
+
+use std::collections::HashMap;
+
+/// Bits kept per sample: 1024 linear sub-buckets per power-of-two range,
+/// i.e. 3 significant digits.
+const SIGNIFICANT_BITS: u32 = 11;
+
+/// Constant-memory latency histogram in integer nanoseconds.
+///
+/// Count, sum, min and max are tracked exactly.
+#[derive(Default)]
+pub struct Histogram {
+    counts: HashMap<u64, u64>,
+    pub count: u64,
+    pub total: u64,
+    pub min: u64,
+    pub max: u64,
+}
+
+fn bit_length(value: u64) -> u32 {
+    u64::BITS - value.leading_zeros()
+}
+
+impl Histogram {
+    /// Record one latency sample.
+    pub fn record(&mut self, value: u64) {
+        self.count += 1;
+        self.total += value;
+        if self.count == 1 || value < self.min {
+            self.min = value;
+        }
+        self.max = self.max.max(value);
+        // Lowest value of the sub-bucket that holds value
+        let shift = bit_length(value).saturating_sub(SIGNIFICANT_BITS);
+        *self.counts.entry(value >> shift << shift).or_insert(0) += 1;
+    }
+
+    /// Add all samples recorded in other.
+    pub fn merge(&mut self, other: &Histogram) {
+        if other.count == 0 {
+            return;
+        }
+        if self.count == 0 || other.min < self.min {
+            self.min = other.min;
+        }
+        self.max = self.max.max(other.max);
+        self.count += other.count;
+        self.total += other.total;
+        for (&bucket, &count) in &other.counts {
+            *self.counts.entry(bucket).or_insert(0) += count;
+        }
+    }
+
+    /// Return the highest value equivalent to the p-th percentile sample.
+    pub fn percentile(&self, p: f64) -> u64 {
+        let rank = self.count.min((self.count as f64 * p / 100.0) as u64 + 1);
+        let mut buckets: Vec<_> = self.counts.iter().collect();
+        buckets.sort_unstable();
+        let mut seen = 0;
+        for (&bucket, &count) in buckets {
+            seen += count;
+            if seen >= rank {
+                let shift = bit_length(bucket).saturating_sub(SIGNIFICANT_BITS);
+                return (bucket + (1 << shift) - 1).min(self.max);
+            }
+        }
+        self.max
+    }
+}
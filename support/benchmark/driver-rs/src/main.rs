@@ -0,0 +1,437 @@
+//! Compiled MygramDB load driver for benchmark.py (`--engine rust`).
+//!
+//! Runs the same workload as the Python drivers (optional warmup, one
+//! persistent connection per worker, `--pipeline` commands per round trip)
+//! on a multi-threaded Tokio runtime, and prints the results dict that
+//! benchmark.py's `summarize()` builds as JSON on stdout.
+
+mod histogram;
+
+use std::ops::Range;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::Arc;
+use std::time::{Duration, Instant};
+
+use clap::{Parser, ValueEnum};
+use serde_json::{json, Map, Value};
+use tokio::io::{AsyncReadExt, AsyncWriteExt};
+use tokio::net::{lookup_host, TcpSocket, TcpStream};
+use tokio::sync::Barrier;
+
+use histogram::Histogram;
+
+/// Initial per-connection receive buffer; it doubles if a response outgrows it.
+const RECV_BUFFER_BYTES: usize = 1 << 16;
+
+/// Response prefixes that mark a successful MygramDB reply.
+const SUCCESS_PREFIXES: [&[u8]; 2] = [b"OK ", b"(integer)"];
+
+#[derive(Clone, Copy, ValueEnum)]
+enum QueryType {
+    Search,
+    Count,
+}
+
+#[derive(Parser)]
+#[command(
+    name = "mygram-bench",
+    version,
+    about = "MygramDB load driver for benchmark.py"
+)]
+struct Args {
+    /// MygramDB host
+    #[arg(long, default_value = "127.0.0.1")]
+    host: String,
+    /// MygramDB port
+    #[arg(long, default_value_t = 11016)]
+    port: u16,
+    /// Table name
+    #[arg(long)]
+    table: String,
+    /// Comma-separated search words
+    #[arg(long)]
+    words: String,
+    /// Query type
+    #[arg(long, value_enum, default_value_t = QueryType::Search)]
+    query_type: QueryType,
+    /// LIMIT for search queries
+    #[arg(long, default_value_t = 100)]
+    limit: u64,
+    /// OFFSET for search queries (pagination)
+    #[arg(long, default_value_t = 0)]
+    offset: u64,
+    /// Number of concurrent connections
+    #[arg(long, default_value_t = 1)]
+    concurrency: usize,
+    /// Iterations per query
+    #[arg(long, default_value_t = 5)]
+    iterations: usize,
+    /// Commands sent per round trip on each connection
+    #[arg(long, default_value_t = 1)]
+    pipeline: usize,
+    /// Untimed queries run before measurement starts (0 to disable)
+    #[arg(long, default_value_t = 100)]
+    warmup: usize,
+    /// Comma-separated latency percentiles to report
+    #[arg(long, value_delimiter = ',', default_values_t = [50.0, 95.0, 99.0])]
+    percentiles: Vec<f64>,
+    /// Runtime worker threads (0 uses every available CPU)
+    #[arg(long, default_value_t = 0)]
+    threads: usize,
+    /// Per-read timeout in seconds
+    #[arg(long, default_value_t = 60.0)]
+    timeout: f64,
+    /// SO_RCVBUF in bytes (0 keeps kernel autotuning)
+    #[arg(long, default_value_t = 0)]
+    rcvbuf: u32,
+    /// SO_SNDBUF in bytes (0 keeps kernel autotuning)
+    #[arg(long, default_value_t = 0)]
+    sndbuf: u32,
+    /// Error messages kept in the output; the failure count is always exact
+    #[arg(long, default_value_t = 100)]
+    max_errors: usize,
+}
+
+/// Build MygramDB commands, already framed for the wire.
+fn build_queries(args: &Args) -> Vec<Vec<u8>> {
+    let (prefix, suffix) = match args.query_type {
+        QueryType::Search => {
+            let paging = if args.offset > 0 {
+                format!("{},{}", args.offset, args.limit)
+            } else {
+                args.limit.to_string()
+            };
+            (
+                format!("SEARCH {} ", args.table),
+                format!(" SORT id ASC LIMIT {paging}"),
+            )
+        }
+        QueryType::Count => (format!("COUNT {} ", args.table), String::new()),
+    };
+    args.words
+        .split(',')
+        .map(|word| format!("{prefix}{}{suffix}\r\n", word.trim()).into_bytes())
+        .collect()
+}
+
+/// Queries handed out in order to whichever worker asks next, like the
+/// Python drivers' shared lazy iterator.
+struct Workload {
+    next: AtomicUsize,
+    total: usize,
+}
+
+impl Workload {
+    fn new(total: usize) -> Self {
+        Self {
+            next: AtomicUsize::new(0),
+            total,
+        }
+    }
+
+    fn take(&self, size: usize) -> Option<Range<usize>> {
+        let start = self.next.fetch_add(size, Ordering::Relaxed);
+        (start < self.total).then(|| start..self.total.min(start + size))
+    }
+}
+
+struct Context {
+    args: Args,
+    queries: Vec<Vec<u8>>,
+    warmup: Workload,
+    timed: Workload,
+    timeout: Duration,
+}
+
+/// Per-worker results, merged once the run is over.
+#[derive(Default)]
+struct Stats {
+    hist: Histogram,
+    failed: usize,
+    errors: Vec<String>,
+}
+
+impl Stats {
+    fn fail(&mut self, message: &str, count: usize, max_errors: usize) {
+        self.failed += count;
+        let keep = count.min(max_errors.saturating_sub(self.errors.len()));
+        self.errors
+            .extend(std::iter::repeat_n(message.to_owned(), keep));
+    }
+}
+
+async fn connect(args: &Args) -> std::io::Result<TcpStream> {
+    let mut last_error = None;
+    for addr in lookup_host((args.host.as_str(), args.port)).await? {
+        let socket = if addr.is_ipv4() {
+            TcpSocket::new_v4()?
+        } else {
+            TcpSocket::new_v6()?
+        };
+        socket.set_keepalive(true)?;
+        // Buffer sizes must be set before connect to affect the window scale
+        if args.rcvbuf > 0 {
+            socket.set_recv_buffer_size(args.rcvbuf)?;
+        }
+        if args.sndbuf > 0 {
+            socket.set_send_buffer_size(args.sndbuf)?;
+        }
+        match socket.connect(addr).await {
+            Ok(stream) => {
+                stream.set_nodelay(true)?;
+                return Ok(stream);
+            }
+            Err(e) => last_error = Some(e),
+        }
+    }
+    Err(last_error.unwrap_or_else(|| std::io::Error::other("no address resolved")))
+}
+
+/// Send one pipelined frame and read `expected` responses, recording each.
+///
+/// On an I/O error, returns the number of responses already recorded along
+/// with the error.
+async fn round_trip(
+    ctx: &Context,
+    stream: &mut TcpStream,
+    frame: &[u8],
+    expected: usize,
+    buf: &mut Vec<u8>,
+    stats: &mut Stats,
+) -> Result<(), (usize, String)> {
+    let start = Instant::now();
+    stream
+        .write_all(frame)
+        .await
+        .map_err(|e| (0, e.to_string()))?;
+
+    let mut answered = 0;
+    let mut offset = 0;
+    let mut scan = 0;
+    let mut filled = 0;
+    while answered < expected {
+        if filled == buf.len() {
+            buf.resize(buf.len() * 2, 0);
+        }
+        let received =
+            match tokio::time::timeout(ctx.timeout, stream.read(&mut buf[filled..])).await {
+                Ok(Ok(0)) => return Err((answered, "connection closed by server".into())),
+                Ok(Ok(n)) => n,
+                Ok(Err(e)) => return Err((answered, e.to_string())),
+                Err(_) => return Err((answered, format!("timed out after {}s", ctx.args.timeout))),
+            };
+        let elapsed_ns = start.elapsed().as_nanos() as u64;
+        filled += received;
+        // Each response ends with \r\n (possibly split across reads)
+        while answered < expected {
+            let Some(pos) = buf[scan..filled].windows(2).position(|w| w == b"\r\n") else {
+                scan = filled.saturating_sub(1).max(scan);
+                break;
+            };
+            let end = scan + pos + 2;
+            let response = &buf[offset..end];
+            if SUCCESS_PREFIXES
+                .iter()
+                .any(|prefix| response.starts_with(prefix))
+            {
+                stats.hist.record(elapsed_ns);
+            } else {
+                stats.fail(&String::from_utf8_lossy(response), 1, ctx.args.max_errors);
+            }
+            answered += 1;
+            offset = end;
+            scan = end;
+        }
+    }
+    Ok(())
+}
+
+/// Runs batches from work until it is drained. With start, the worker waits
+/// there holding its first batch, so every worker gets one.
+async fn run_phase(
+    ctx: &Context,
+    work: &Workload,
+    mut start: Option<&Barrier>,
+    conn: &mut Option<TcpStream>,
+    buf: &mut Vec<u8>,
+    stats: &mut Stats,
+) {
+    let mut frame = Vec::new();
+    while let Some(batch) = work.take(ctx.args.pipeline) {
+        if let Some(barrier) = start.take() {
+            barrier.wait().await;
+        }
+        let expected = batch.len();
+        frame.clear();
+        for i in batch {
+            frame.extend_from_slice(&ctx.queries[i % ctx.queries.len()]);
+        }
+
+        let stream = match conn {
+            Some(stream) => stream,
+            None => match connect(&ctx.args).await {
+                Ok(stream) => conn.insert(stream),
+                Err(e) => {
+                    stats.fail(&e.to_string(), expected, ctx.args.max_errors);
+                    continue;
+                }
+            },
+        };
+        if let Err((answered, message)) =
+            round_trip(ctx, stream, &frame, expected, buf, stats).await
+        {
+            *conn = None;
+            stats.fail(&message, expected - answered, ctx.args.max_errors);
+        }
+    }
+    if let Some(barrier) = start {
+        barrier.wait().await;
+    }
+}
+
+async fn worker(
+    ctx: Arc<Context>,
+    warming: Arc<Barrier>,
+    warmed: Arc<Barrier>,
+    go: Arc<Barrier>,
+) -> Stats {
+    let mut conn = None;
+    let mut buf = vec![0; RECV_BUFFER_BYTES];
+    // Workers run their first warmup batch together, so the first tasks to
+    // be scheduled cannot drain the warmup before the rest connect
+    run_phase(
+        &ctx,
+        &ctx.warmup,
+        Some(&warming),
+        &mut conn,
+        &mut buf,
+        &mut Stats::default(),
+    )
+    .await;
+    warmed.wait().await;
+    go.wait().await;
+    let mut stats = Stats::default();
+    run_phase(&ctx, &ctx.timed, None, &mut conn, &mut buf, &mut stats).await;
+    stats
+}
+
+async fn run(ctx: Arc<Context>) -> Value {
+    let concurrency = ctx.args.concurrency;
+    // Every worker finishes its warmup, then the clock starts before any
+    // of them is released into the timed phase
+    let warming = Arc::new(Barrier::new(concurrency));
+    let warmed = Arc::new(Barrier::new(concurrency + 1));
+    let go = Arc::new(Barrier::new(concurrency + 1));
+    let tasks: Vec<_> = (0..concurrency)
+        .map(|_| {
+            tokio::spawn(worker(
+                ctx.clone(),
+                warming.clone(),
+                warmed.clone(),
+                go.clone(),
+            ))
+        })
+        .collect();
+
+    warmed.wait().await;
+    let start = Instant::now();
+    go.wait().await;
+    let mut total = Stats::default();
+    for task in tasks {
+        let stats = task.await.expect("worker panicked");
+        total.hist.merge(&stats.hist);
+        total.failed += stats.failed;
+        let keep = ctx.args.max_errors.saturating_sub(total.errors.len());
+        total.errors.extend(stats.errors.into_iter().take(keep));
+    }
+    let total_time_ms = start.elapsed().as_nanos() as f64 / 1e6;
+
+    summarize(&ctx.args, ctx.timed.total, total_time_ms, &total)
+}
+
+/// Whether n samples are enough for percentile p to differ from the maximum,
+/// as in benchmark.py: at least 100 / (100 - p), allowing for 100 - p not
+/// being exact in binary.
+fn has_enough_samples(p: f64, n: f64) -> bool {
+    p <= 50.0 || n * (100.0 - p) >= 100.0 - 1e-9
+}
+
+/// Same keys and reporting rules as benchmark.py's `summarize()`.
+fn summarize(args: &Args, total_queries: usize, total_time_ms: f64, stats: &Stats) -> Value {
+    let hist = &stats.hist;
+    let mut results = json!({
+        "total_queries": total_queries,
+        "successful": hist.count,
+        "failed": stats.failed,
+        "total_time_ms": total_time_ms,
+        "errors": stats.errors,
+    });
+    if hist.count > 0 {
+        let n = hist.count as f64;
+        let mut percentiles = Map::new();
+        for &p in &args.percentiles {
+            if has_enough_samples(p, n) {
+                percentiles.insert(p.to_string(), json!(hist.percentile(p) as f64 / 1e6));
+            }
+        }
+        results["avg_ms"] = json!(hist.total as f64 / n / 1e6);
+        results["min_ms"] = json!(hist.min as f64 / 1e6);
+        results["max_ms"] = json!(hist.max as f64 / 1e6);
+        results["percentiles_ms"] = Value::Object(percentiles);
+    }
+    results
+}
+
+fn main() {
+    let args = Args::parse();
+    if args.concurrency == 0 || args.pipeline == 0 {
+        eprintln!("error: --concurrency and --pipeline must be at least 1");
+        std::process::exit(2);
+    }
+    if !args.percentiles.iter().all(|&p| 0.0 < p && p < 100.0) {
+        eprintln!("error: percentiles must be between 0 and 100 (exclusive)");
+        std::process::exit(2);
+    }
+
+    let threads = match args.threads {
+        0 => std::thread::available_parallelism().map_or(1, |n| n.get()),
+        n => n,
+    };
+    let runtime = tokio::runtime::Builder::new_multi_thread()
+        .worker_threads(threads)
+        .enable_io()
+        .enable_time()
+        .build()
+        .expect("failed to start the Tokio runtime");
+
+    let queries = build_queries(&args);
+    let ctx = Arc::new(Context {
+        // At least one full batch per worker
+        warmup: Workload::new(if args.warmup > 0 {
+            args.warmup.max(args.concurrency * args.pipeline)
+        } else {
+            0
+        }),
+        timed: Workload::new(queries.len() * args.iterations),
+        timeout: Duration::from_secs_f64(args.timeout),
+        queries,
+        args,
+    });
+
+    let results = runtime.block_on(run(ctx));
+    println!("{results}");
+}
+
+#[cfg(test)]
+mod tests {
+    use super::has_enough_samples;
+
+    #[test]
+    fn tail_percentile_boundaries() {
+        assert!(has_enough_samples(99.9, 1000.0));
+        assert!(!has_enough_samples(99.9, 999.0));
+        assert!(has_enough_samples(95.0, 20.0));
+        assert!(!has_enough_samples(95.0, 19.0));
+        assert!(has_enough_samples(50.0, 1.0));
+    }
+}